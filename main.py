@@ -4,14 +4,58 @@ Downloads MP3 audio from YouTube videos or playlists.
 """
 
 import os
+import re
 import sys
 import argparse
+import atexit
+import functools
+import itertools
 import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from urllib.parse import urlparse, parse_qs
+from types import MappingProxyType
 import yt_dlp
 
 
+# Number of videos downloaded in parallel; kept small to stay under YouTube's per-IP rate limits
+MAX_WORKERS = 4
+
+_PLAYLIST_RE = re.compile(r'^https?://(?:[\w-]+\.)*(?:youtube\.com|youtu\.be)/[^?#]*\?(?:[^#]*&)?list=')
+_LIST_PARAM_RE = re.compile(r'&list=([^&#]+)')
+_WATCH_URL = "https://www.youtube.com/watch?v={}".format
+
+# yt-dlp options shared by every download; get_ydl_opts() adds the output template
+_YDL_BASE_OPTS = MappingProxyType({
+    'format': 'bestaudio/best',
+    'postprocessors': ({
+        'key': 'FFmpegExtractAudio',
+        'preferredcodec': 'mp3',
+        'preferredquality': '192',
+    },),
+    'ignoreerrors': True,  # Continue on errors
+    'no_warnings': False,
+    'extractaudio': True,
+    'audioformat': 'mp3',
+    'embed_subs': False,
+    'writesubtitles': False,
+    'concurrent_fragment_downloads': 8,  # Parallel HLS/DASH fragments within a video
+    'buffersize': 64 * 1024,  # Initial download buffer (yt-dlp default is 1024 bytes)
+    'socket_timeout': 15,  # Fail fast on stuck connections instead of stalling a worker
+    'retries': 3,
+})
+
+# How long resolved addresses are reused, see install_dns_cache()
+DNS_CACHE_TTL = 300
+
+# Idle YoutubeDL instances, keyed by their (hashable) options
+_ydl_pool = {}
+_ydl_pool_lock = threading.Lock()
+
+
 def setup_logging():
     """Set up logging configuration."""
     logging.basicConfig(
@@ -25,30 +69,99 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
+def install_dns_cache(ttl=DNS_CACHE_TTL, maxsize=256):
+    """Cache socket.getaddrinfo results so repeated connections skip DNS lookups."""
+    real_getaddrinfo = socket.getaddrinfo
+    if getattr(real_getaddrinfo, 'is_dns_cache', False):
+        return
+    cache = {}
+    lock = threading.Lock()
+
+    def cached_getaddrinfo(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with lock:
+            hit = cache.get(key)
+        if hit and hit[0] > now:
+            return list(hit[1])
+        
+        result = real_getaddrinfo(*args, **kwargs)
+        with lock:
+            if len(cache) >= maxsize:
+                cache.pop(next(iter(cache)))  # Evict the oldest entry
+            cache[key] = (now + ttl, result)
+        return list(result)
+
+    cached_getaddrinfo.is_dns_cache = True
+    socket.getaddrinfo = cached_getaddrinfo
+
+
+@functools.lru_cache(maxsize=4096)
 def is_playlist_url(url):
     """Check if the URL is a YouTube playlist."""
-    parsed_url = urlparse(url)
-    if 'youtube.com' in parsed_url.netloc or 'youtu.be' in parsed_url.netloc:
-        return 'list=' in parsed_url.query
-    return False
+    return _PLAYLIST_RE.match(url) is not None
 
 
-def read_urls_from_file(file_path):
-    """Read URLs from a text file."""
-    urls = []
+def iter_urls_from_file(file_path):
+    """Lazily yield unique URLs from a text file, or from stdin when the path is '-'."""
+    seen = set()
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line_num, line in enumerate(file, 1):
+        if file_path == '-':
+            file = sys.stdin
+        else:
+            file = open(file_path, 'r', encoding='utf-8')
+        with file:
+            for line in file:
                 line = line.strip()
-                if line and not line.startswith('#'):  # Skip empty lines and comments
-                    urls.append(line)
-        return urls
+                if line and line[0] != '#' and line not in seen:  # Skip empty lines, comments, repeats
+                    seen.add(line)
+                    yield line
     except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {file_path}")
     except Exception as e:
         raise Exception(f"Error reading file {file_path}: {str(e)}")
 
 
+def _hashable(value):
+    """Convert nested option values into a hashable form for use as a cache key."""
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+@contextmanager
+def pooled_ydl(opts):
+    """Borrow an idle YoutubeDL built with these options, creating one if needed.
+
+    Instances keep their loaded extractors and open connections between uses,
+    but are never shared by two threads at the same time.
+    """
+    key = _hashable(opts)
+    with _ydl_pool_lock:
+        idle = _ydl_pool.setdefault(key, [])
+        ydl = idle.pop() if idle else None
+    if ydl is None:
+        # yt-dlp fills defaults into its params dict, so hand it a copy
+        ydl = yt_dlp.YoutubeDL(dict(opts))
+    try:
+        yield ydl
+    finally:
+        with _ydl_pool_lock:
+            _ydl_pool[key].append(ydl)
+
+
+@atexit.register
+def _close_pooled_ydl():
+    """Close every pooled YoutubeDL instance on interpreter exit."""
+    with _ydl_pool_lock:
+        for idle in _ydl_pool.values():
+            for ydl in idle:
+                ydl.close()
+        _ydl_pool.clear()
+
+
 def create_output_directory(output_dir):
     """Create output directory if it doesn't exist."""
     Path(output_dir).mkdir(parents=True, exist_ok=True)
@@ -56,60 +169,77 @@ def create_output_directory(output_dir):
 
 def get_ydl_opts(output_dir):
     """Get yt-dlp options for audio download."""
-    return {
-        'format': 'bestaudio/best',
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
-        'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
-        'ignoreerrors': True,  # Continue on errors
-        'no_warnings': False,
-        'extractaudio': True,
-        'audioformat': 'mp3',
-        'embed_subs': False,
-        'writesubtitles': False,
-    }
+    # yt-dlp writes into its top-level params, so always return a fresh dict
+    return {**_YDL_BASE_OPTS, 'outtmpl': f"{output_dir}/%(title)s.%(ext)s"}
 
 
-def download_audio(urls, output_dir, logger):
-    """Download audio from YouTube URLs."""
+def _download_one(url, ydl_opts):
+    """Download a single URL with its own YoutubeDL instance.
+
+    Returns a ``(url, ok, title, error)`` tuple.
+    """
+    title = 'Unknown Title'
+    try:
+        with pooled_ydl(ydl_opts) as ydl:
+            # With ignoreerrors, yt-dlp logs download/ffmpeg errors and still
+            # returns the info dict; the retcode is its only record of them.
+            # Pooled instances keep it from earlier calls, so reset it first.
+            ydl._download_retcode = 0
+            # A single extraction pass both resolves the title and downloads
+            info = ydl.extract_info(url, download=True)
+            failed = ydl._download_retcode != 0
+        if not info:
+            return url, False, title, yt_dlp.DownloadError('No information extracted')
+        title = info.get('title', title)
+        if failed:
+            return url, False, title, yt_dlp.DownloadError('Download or conversion failed')
+        return url, True, title, None
+    except Exception as e:
+        return url, False, title, e
+
+
+def download_audio(urls, output_dir, logger, max_workers=MAX_WORKERS):
+    """Download audio from YouTube URLs (any iterable, consumed lazily)."""
+    output_dir = os.path.abspath(output_dir)
     create_output_directory(output_dir)
+    total = len(urls) if hasattr(urls, '__len__') else None
     
     ydl_opts = get_ydl_opts(output_dir)
     successful_downloads = 0
     failed_downloads = 0
     
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {}
         for i, url in enumerate(urls, 1):
-            try:
-                logger.info(f"Processing ({i}/{len(urls)}): {url}")
-                
-                # Extract info first to get title
-                info = ydl.extract_info(url, download=False)
-                if info:
-                    title = info.get('title', 'Unknown Title')
-                    logger.info(f"Title: {title}")
-                
-                # Download the audio
-                ydl.download([url])
+            position = f"{i}/{total}" if total is not None else f"processed {i}"
+            logger.info(f"Processing ({position}): {url}")
+            futures[executor.submit(_download_one, url, ydl_opts)] = url
+        
+        for future in as_completed(futures):
+            url, ok, title, error = future.result()
+            if ok:
                 successful_downloads += 1
                 logger.info(f"✓ Successfully downloaded: {title}")
-                
-            except yt_dlp.DownloadError as e:
+            elif isinstance(error, yt_dlp.DownloadError):
                 failed_downloads += 1
-                logger.error(f"✗ Download failed for {url}: {str(e)}")
-            except Exception as e:
+                logger.error(f"✗ Download failed for {url}: {str(error)}")
+            else:
                 failed_downloads += 1
-                logger.error(f"✗ Unexpected error for {url}: {str(e)}")
+                logger.error(f"✗ Unexpected error for {url}: {str(error)}")
+    except BaseException:
+        # Drop queued downloads so Ctrl+C or a bad input line stops the run
+        # instead of draining the queue
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
     
     # Summary
     logger.info(f"\n=== Download Summary ===")
     logger.info(f"Successful downloads: {successful_downloads}")
     logger.info(f"Failed downloads: {failed_downloads}")
-    logger.info(f"Total processed: {len(urls)}")
-    logger.info(f"Output directory: {os.path.abspath(output_dir)}")
+    logger.info(f"Total processed: {len(futures)}")
+    logger.info(f"Output directory: {output_dir}")
 
 
 def extract_playlist_urls(playlist_url, logger):
@@ -121,11 +251,13 @@ def extract_playlist_urls(playlist_url, logger):
         'no_warnings': False,
         'extract_flat': True,  # Only extract URLs, don't download
         'ignoreerrors': True,
+        'socket_timeout': 15,
+        'retries': 3,
     }
     
     urls = []
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with pooled_ydl(ydl_opts) as ydl:
             logger.info("Attempting to extract playlist information...")
             info = ydl.extract_info(playlist_url, download=False)
             
@@ -149,7 +281,7 @@ def extract_playlist_urls(playlist_url, logger):
                             urls.append(video_url)
                             logger.info(f"  [{i+1}] {video_title}")
                         elif video_id:
-                            constructed_url = f"https://www.youtube.com/watch?v={video_id}"
+                            constructed_url = _WATCH_URL(video_id)
                             urls.append(constructed_url)
                             logger.info(f"  [{i+1}] {video_title} (constructed URL)")
                         else:
@@ -158,7 +290,7 @@ def extract_playlist_urls(playlist_url, logger):
                 # Handle case where it's a single video with playlist parameter
                 elif info.get('_type') in ['video', None] and info.get('id'):
                     logger.info("URL appears to be a single video, not a playlist")
-                    video_url = f"https://www.youtube.com/watch?v={info['id']}"
+                    video_url = _WATCH_URL(info['id'])
                     urls.append(video_url)
                     logger.info(f"Added single video: {info.get('title', 'Unknown Title')}")
                 
@@ -179,7 +311,7 @@ def extract_playlist_urls(playlist_url, logger):
             with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
                 info = ydl.extract_info(playlist_url, download=False)
                 if info and info.get('id'):
-                    single_url = f"https://www.youtube.com/watch?v={info['id']}"
+                    single_url = _WATCH_URL(info['id'])
                     logger.info(f"Treating as single video: {info.get('title', 'Unknown')}")
                     return [single_url]
         except Exception as e2:
@@ -196,6 +328,7 @@ def main():
         epilog='''
 Examples:
   python youtube_audio_downloader.py -f urls.txt -o ./downloads
+  cat urls.txt | python youtube_audio_downloader.py -f - -o ./downloads
   python youtube_audio_downloader.py -p "https://www.youtube.com/playlist?list=PLxxxxxx" -o ./music
   python youtube_audio_downloader.py -u "https://www.youtube.com/watch?v=xxxxxx" -o ./audio
         '''
@@ -204,7 +337,7 @@ Examples:
     # Input source (mutually exclusive)
     input_group = parser.add_mutually_exclusive_group(required=True)
     input_group.add_argument('-f', '--file', 
-                           help='Text file containing YouTube URLs (one per line)')
+                           help="Text file containing YouTube URLs (one per line, '-' for stdin)")
     input_group.add_argument('-p', '--playlist', 
                            help='YouTube playlist URL')
     input_group.add_argument('-u', '--url', 
@@ -215,11 +348,18 @@ Examples:
                        default='./downloads',
                        help='Output directory for MP3 files (default: ./downloads)')
     
+    # Parallelism
+    parser.add_argument('-w', '--workers', 
+                       type=int,
+                       default=MAX_WORKERS,
+                       help=f'Number of videos to download in parallel (default: {MAX_WORKERS})')
+    
     args = parser.parse_args()
     
     # Set up logging
     logger = setup_logging()
     logger.info("YouTube Audio Downloader started")
+    install_dns_cache()
     
     try:
         urls = []
@@ -227,7 +367,10 @@ Examples:
         # Determine input source and collect URLs
         if args.file:
             logger.info(f"Reading URLs from file: {args.file}")
-            urls = read_urls_from_file(args.file)
+            urls = iter_urls_from_file(args.file)
+            # Pull the first URL now so missing/unreadable files fail early
+            first_url = next(urls, None)
+            urls = itertools.chain([first_url], urls) if first_url else []
         elif args.playlist:
             logger.info(f"Processing playlist: {args.playlist}")
             urls = extract_playlist_urls(args.playlist, logger)
@@ -237,9 +380,9 @@ Examples:
                 logger.info("Trying alternative playlist extraction methods...")
                 
                 # Method 1: Try removing extra parameters
-                if '&list=' in args.playlist:
-                    clean_playlist_url = args.playlist.split('&list=')[1].split('&')[0]
-                    clean_url = f"https://www.youtube.com/playlist?list={clean_playlist_url}"
+                list_match = _LIST_PARAM_RE.search(args.playlist)
+                if list_match:
+                    clean_url = f"https://www.youtube.com/playlist?list={list_match.group(1)}"
                     logger.info(f"Trying clean playlist URL: {clean_url}")
                     try:
                         urls = extract_playlist_urls(clean_url, logger)
@@ -252,17 +395,18 @@ Examples:
                     try:
                         ydl_opts_alt = {
                             'quiet': False,
-                            'extract_flat': False,  # Try full extraction
+                            # Resolve the URL itself, but list entries without one request per video
+                            'extract_flat': 'in_playlist',
                             'playlistend': 50,  # Limit to first 50 videos
                         }
                         with yt_dlp.YoutubeDL(ydl_opts_alt) as ydl:
                             info = ydl.extract_info(args.playlist, download=False)
                             if info and info.get('entries'):
                                 for entry in info['entries']:
-                                    if entry and entry.get('webpage_url'):
-                                        urls.append(entry['webpage_url'])
+                                    if entry and (entry.get('webpage_url') or entry.get('url')):
+                                        urls.append(entry.get('webpage_url') or entry['url'])
                                     elif entry and entry.get('id'):
-                                        urls.append(f"https://www.youtube.com/watch?v={entry['id']}")
+                                        urls.append(_WATCH_URL(entry['id']))
                                 logger.info(f"Alternative method found {len(urls)} videos")
                     except Exception as e:
                         logger.warning(f"Alternative extraction failed: {e}")
@@ -274,10 +418,11 @@ Examples:
             logger.error("No URLs found to process")
             sys.exit(1)
         
-        logger.info(f"Total URLs to process: {len(urls)}")
+        if isinstance(urls, list):
+            logger.info(f"Total URLs to process: {len(urls)}")
         
         # Download audio files
-        download_audio(urls, args.output, logger)
+        download_audio(urls, args.output, logger, max_workers=args.workers)
         
         logger.info("YouTube Audio Downloader completed")
         
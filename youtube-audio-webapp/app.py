@@ -4,30 +4,106 @@ YouTube Audio Downloader - Flask Web UI
 
 import os
 import sys
+import atexit
+import hashlib
+import json
 import logging
+import queue
+import socket
 import threading
 import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_file
+from types import MappingProxyType
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from werkzeug.utils import secure_filename
+from werkzeug.wsgi import FileWrapper
 import yt_dlp
 
+from cache import clear_cache, get_many, put_many, video_id_from_url
+
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['DOWNLOAD_FOLDER'] = 'downloads'
+app.config['MAX_WORKERS'] = 4  # Parallel video downloads; keep low to avoid YouTube rate limits
+# Only for Apache mod_xsendfile or lighttpd, which serve the file named in the
+# X-Sendfile header; nginx ignores that header and would send empty bodies
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+
+# Resolved once at startup so request handlers can build paths with plain f-strings
+DOWNLOAD_DIR = str(Path(app.config['DOWNLOAD_FOLDER']).resolve())
+
+LOG_LIMIT = 100  # Number of log entries kept for the UI
+STREAM_CHUNK_SIZE = 1024 * 1024  # Read size when Python itself streams an MP3
+_WATCH_URL = "https://www.youtube.com/watch?v={}".format
+
+
+@dataclass
+class DownloadStatus:
+    """Progress of the current download job."""
+    is_downloading: bool = False
+    current_video: str = ''
+    progress: float = 0.0
+    total_videos: int = 0
+    completed: int = 0
+    failed: int = 0
+    logs: deque = field(default_factory=lambda: deque(maxlen=LOG_LIMIT))
+    download_urls: list = field(default_factory=list)
+
+
+# Global state for download progress; guarded by status_lock
+download_status = DownloadStatus()
+status_lock = threading.Lock()
+
+# One queue per connected /api/events client
+status_subscribers = set()
+
+# Bumped on every status change; /api/status re-encodes only when it moves
+status_version = 0
+_status_body = (-1, '', '')  # (version, JSON body, ETag)
+
+# (title, percent) of each video currently downloading, keyed by video ID;
+# guarded by status_lock and folded into download_status.progress
+_in_flight = {}
+
+# IDs each worker thread added to _in_flight; one URL can expand to several
+# videos, and all of them are dropped when the worker finishes that URL
+_worker = threading.local()
+
+# yt-dlp reports progress after every block it reads, so progress events are
+# published only when the whole percent changes or this many seconds passed
+PROGRESS_PUBLISH_INTERVAL = 0.25
+_last_progress = (None, 0.0)  # (whole percent, time.monotonic()) last published
+
+# (directory, mtime, entries) of the last MP3 scan, see scan_mp3_files()
+_mp3_scan = (None, None, [])
 
-# Global state for download progress
-download_status = {
-    'is_downloading': False,
-    'current_video': '',
-    'progress': 0,
-    'total_videos': 0,
-    'completed': 0,
-    'failed': 0,
-    'logs': [],
-    'download_urls': []
-}
+# yt-dlp options shared by every download; get_ydl_opts() adds the per-job parts
+_YDL_BASE_OPTS = MappingProxyType({
+    'format': 'bestaudio/best',
+    'postprocessors': ({
+        'key': 'FFmpegExtractAudio',
+        'preferredcodec': 'mp3',
+        'preferredquality': '192',
+    },),
+    'ignoreerrors': True,
+    'no_warnings': False,
+    'concurrent_fragment_downloads': 8,
+    'buffersize': 64 * 1024,
+    'socket_timeout': 15,  # Fail fast on stuck connections instead of stalling a worker
+    'retries': 3,
+})
+
+# How long resolved addresses are reused, see install_dns_cache()
+DNS_CACHE_TTL = 300
+
+# Idle YoutubeDL instances, keyed by their (hashable) options
+_ydl_pool = {}
+_ydl_pool_lock = threading.Lock()
 
 # Setup logging
 logging.basicConfig(
@@ -37,35 +113,227 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def install_dns_cache(ttl=DNS_CACHE_TTL, maxsize=256):
+    """Cache socket.getaddrinfo results so repeated connections skip DNS lookups."""
+    real_getaddrinfo = socket.getaddrinfo
+    if getattr(real_getaddrinfo, 'is_dns_cache', False):
+        return
+    cache = {}
+    lock = threading.Lock()
+
+    def cached_getaddrinfo(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with lock:
+            hit = cache.get(key)
+        if hit and hit[0] > now:
+            return list(hit[1])
+        
+        result = real_getaddrinfo(*args, **kwargs)
+        with lock:
+            if len(cache) >= maxsize:
+                cache.pop(next(iter(cache)))  # Evict the oldest entry
+            cache[key] = (now + ttl, result)
+        return list(result)
+
+    cached_getaddrinfo.is_dns_cache = True
+    socket.getaddrinfo = cached_getaddrinfo
+
+
+install_dns_cache()
+
+
 def create_directories():
     """Create necessary directories."""
     Path(app.config['UPLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
-    Path(app.config['DOWNLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
+    Path(DOWNLOAD_DIR).mkdir(parents=True, exist_ok=True)
+
+
+def _hashable(value):
+    """Convert nested option values into a hashable form for use as a cache key."""
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+@contextmanager
+def pooled_ydl(opts):
+    """Borrow an idle YoutubeDL built with these options, creating one if needed.
+
+    Instances keep their loaded extractors and open connections between uses,
+    but are never shared by two threads at the same time.
+    """
+    key = _hashable(opts)
+    with _ydl_pool_lock:
+        idle = _ydl_pool.setdefault(key, [])
+        ydl = idle.pop() if idle else None
+    if ydl is None:
+        # yt-dlp fills defaults into its params dict, so hand it a copy
+        ydl = yt_dlp.YoutubeDL(dict(opts))
+    try:
+        yield ydl
+    finally:
+        with _ydl_pool_lock:
+            _ydl_pool[key].append(ydl)
+
+
+@atexit.register
+def _close_pooled_ydl():
+    """Close every pooled YoutubeDL instance on interpreter exit."""
+    with _ydl_pool_lock:
+        for idle in _ydl_pool.values():
+            for ydl in idle:
+                ydl.close()
+        _ydl_pool.clear()
+
+
+def publish(event):
+    """Push an event to every /api/events subscriber. Caller holds status_lock.
+
+    Every status change is published, so this also bumps status_version.
+    """
+    global status_version
+    status_version += 1
+    for subscriber in status_subscribers:
+        subscriber.put(event)
+
+
+def status_snapshot():
+    """Return a JSON-serializable copy of the status. Caller holds status_lock."""
+    # Shallow copy: log entries are never mutated once appended, so there is no
+    # need for asdict()'s deep copy of the whole log buffer
+    snapshot = {f.name: getattr(download_status, f.name) for f in fields(download_status)}
+    snapshot['logs'] = list(download_status.logs)
+    return snapshot
+
+
+def update_status(**changes):
+    """Update status fields and push the changes to subscribers."""
+    with status_lock:
+        for name, value in changes.items():
+            setattr(download_status, name, value)
+        publish({'type': 'status', 'changes': changes})
+
+
+def scan_mp3_files(directory):
+    """Return (name, path) pairs for the MP3 files in a directory.
+
+    The result is cached against the directory mtime, so repeated calls only
+    hit readdir when files were actually added or removed.
+    """
+    global _mp3_scan
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    
+    cached_dir, cached_mtime, entries = _mp3_scan
+    if cached_dir != directory or cached_mtime != mtime:
+        with os.scandir(directory) as it:
+            entries = [(e.name, e.path) for e in it
+                       if e.name.endswith('.mp3') and e.is_file(follow_symlinks=False)]
+        _mp3_scan = (directory, mtime, entries)
+    return entries
 
 
 def add_log(message, level='info'):
     """Add a log message to the status."""
-    timestamp = time.strftime('%H:%M:%S')
-    download_status['logs'].append({
-        'timestamp': timestamp,
+    entry = {
+        'timestamp': time.strftime('%H:%M:%S'),
         'message': message,
         'level': level
-    })
-    # Keep only last 100 logs
-    if len(download_status['logs']) > 100:
-        download_status['logs'] = download_status['logs'][-100:]
+    }
+    with status_lock:
+        download_status.logs.append(entry)
+        publish({'type': 'log', 'log': entry})
+
+
+def _publish_progress(force=True):
+    """Recompute overall progress from the in-flight videos. Caller holds status_lock.
+
+    Unless forced, the update is skipped while it would not move the whole
+    percent and the last one went out less than PROGRESS_PUBLISH_INTERVAL ago.
+    """
+    global _last_progress
+    done = download_status.completed + download_status.failed
+    in_flight = sum(percent for _, percent in _in_flight.values())
+    progress = min((100 * done + in_flight) / max(download_status.total_videos, 1), 100)
+    
+    now = time.monotonic()
+    last_percent, last_time = _last_progress
+    if not force and int(progress) == last_percent and now - last_time < PROGRESS_PUBLISH_INTERVAL:
+        return
+    _last_progress = (int(progress), now)
+    
+    download_status.progress = progress
+    download_status.current_video = ', '.join(title for title, _ in _in_flight.values())
+    publish({'type': 'status', 'changes': {
+        'progress': download_status.progress,
+        'current_video': download_status.current_video,
+    }})
+
+
+def _track_video(video_id, title, percent):
+    """Record the download percent of a single in-flight video."""
+    if video_id is None:
+        return
+    # Hooks run in the worker thread that called extract_info
+    getattr(_worker, 'video_ids', set()).add(video_id)
+    with status_lock:
+        # New videos and completed downloads change current_video; always publish those
+        force = video_id not in _in_flight or percent >= 100
+        _in_flight[video_id] = (title, percent)
+        _publish_progress(force)
+
+
+def _finish_video(video_ids, ok):
+    """Count a finished URL and drop all of its videos from the in-flight set."""
+    with status_lock:
+        for video_id in video_ids:
+            _in_flight.pop(video_id, None)
+        if ok:
+            download_status.completed += 1
+            changes = {'completed': download_status.completed}
+        else:
+            download_status.failed += 1
+            changes = {'failed': download_status.failed}
+        publish({'type': 'status', 'changes': changes})
+        _publish_progress()
 
 
 def progress_hook(d):
     """Hook for yt-dlp progress updates."""
+    info = d.get('info_dict', {})
     if d['status'] == 'downloading':
-        try:
-            percent = d.get('_percent_str', '0%').strip()
-            download_status['progress'] = float(percent.replace('%', ''))
-        except (ValueError, TypeError):
-            pass
+        total = d.get('total_bytes') or d.get('total_bytes_estimate')
+        percent = min(100 * d.get('downloaded_bytes', 0) / total, 100) if total else 0
     elif d['status'] == 'finished':
-        download_status['progress'] = 100
+        percent = 100
+    else:
+        return
+    _track_video(info.get('id'), info.get('title', 'Unknown Title'), percent)
+
+
+def postprocessor_hook(d):
+    """Hook for yt-dlp post-processing updates (MP3 conversion)."""
+    if d['status'] == 'started' and d.get('postprocessor') == 'ExtractAudio':
+        title = d.get('info_dict', {}).get('title', 'Unknown Title')
+        add_log(f"Converting to MP3: {title}")
+
+
+def announce_video(info, *, incomplete=False):
+    """yt-dlp match filter used to report the title once extraction finishes."""
+    if not incomplete:
+        title = info.get('title', 'Unknown Title')
+        with status_lock:
+            # Videos with a cached title were already announced before extraction
+            announced = info.get('id') in _in_flight
+        _track_video(info.get('id'), title, 0)
+        if not announced:
+            add_log(f"Downloading: {title}")
+    return None  # Never reject a video
 
 
 def extract_playlist_urls(playlist_url):
@@ -77,11 +345,14 @@ def extract_playlist_urls(playlist_url):
         'no_warnings': True,
         'extract_flat': True,
         'ignoreerrors': True,
+        'socket_timeout': 15,
+        'retries': 3,
     }
     
     urls = []
+    cache_entries = []
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with pooled_ydl(ydl_opts) as ydl:
             info = ydl.extract_info(playlist_url, download=False)
             
             if info:
@@ -93,15 +364,21 @@ def extract_playlist_urls(playlist_url):
                         
                         video_id = entry.get('id')
                         video_url = entry.get('url')
+                        cache_entries.append((video_id, {
+                            'title': entry.get('title'),
+                            'url': video_url,
+                            'duration': entry.get('duration'),
+                        }))
                         
                         if video_url:
                             urls.append(video_url)
                         elif video_id:
-                            urls.append(f"https://www.youtube.com/watch?v={video_id}")
+                            urls.append(_WATCH_URL(video_id))
                 
                 elif info.get('id'):
-                    urls.append(f"https://www.youtube.com/watch?v={info['id']}")
+                    urls.append(_WATCH_URL(info['id']))
         
+        put_many(cache_entries)
         add_log(f"Found {len(urls)} videos")
         return urls
         
@@ -110,60 +387,114 @@ def extract_playlist_urls(playlist_url):
         return []
 
 
-def download_audio_thread(urls, output_dir):
-    """Download audio in a separate thread."""
-    download_status['is_downloading'] = True
-    download_status['total_videos'] = len(urls)
-    download_status['completed'] = 0
-    download_status['failed'] = 0
-    download_status['current_video'] = ''
-    download_status['progress'] = 0
+def _download_one(url, ydl_opts, cached_title=None):
+    """Download a single URL with its own YoutubeDL instance.
+
+    Returns a ``(url, ok, title, error, info)`` tuple; ``info`` is the
+    extracted info dict, or None if extraction failed.
+    """
+    title = 'Unknown Title'
+    video_id = video_id_from_url(url)
+    info = None
+    _worker.video_ids = set()
+    if cached_title:
+        title = cached_title
+        _track_video(video_id, title, 0)
+        add_log(f"Downloading: {title}")
+    try:
+        with pooled_ydl(ydl_opts) as ydl:
+            # With ignoreerrors, yt-dlp logs download/ffmpeg errors and still
+            # returns the info dict; the retcode is its only record of them.
+            # Pooled instances keep it from earlier calls, so reset it first.
+            ydl._download_retcode = 0
+            # A single extraction pass both resolves the title and downloads
+            info = ydl.extract_info(url, download=True)
+            failed = ydl._download_retcode != 0
+        if not info:
+            ok, error = False, yt_dlp.DownloadError('No information extracted')
+        else:
+            title = info.get('title', title)
+            if failed:
+                ok, error = False, yt_dlp.DownloadError('Download or conversion failed')
+            else:
+                ok, error = True, None
+    except Exception as e:
+        ok, error = False, e
     
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
-        'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
-        'ignoreerrors': True,
-        'no_warnings': False,
+    _finish_video(_worker.video_ids, ok)
+    return url, ok, title, error, info
+
+
+def get_ydl_opts(output_dir):
+    """Get yt-dlp options for audio download."""
+    # yt-dlp writes into its top-level params, so always return a fresh dict
+    return {
+        **_YDL_BASE_OPTS,
+        'outtmpl': f"{output_dir}/%(title)s.%(ext)s",
         'progress_hooks': [progress_hook],
+        'match_filter': announce_video,
+        'postprocessor_hooks': [postprocessor_hook],
     }
+
+
+def download_audio_thread(urls, output_dir):
+    """Download audio in a separate thread."""
+    with status_lock:
+        _in_flight.clear()
+    update_status(
+        is_downloading=True,
+        total_videos=len(urls),
+        completed=0,
+        failed=0,
+        current_video='',
+        progress=0,
+    )
     
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        for i, url in enumerate(urls, 1):
-            title = 'Unknown Title'  # Initialize here
-            try:
-                download_status['progress'] = 0
-                add_log(f"Processing video {i}/{len(urls)}")
-                
-                info = ydl.extract_info(url, download=False)
+    download_urls = []
+    try:
+        ydl_opts = get_ydl_opts(output_dir)
+        # One cache read per job, so titles are known before each extraction starts
+        cached = get_many(video_id_from_url(url) for url in urls)
+        fetched = []
+        
+        add_log(f"Processing {len(urls)} video(s), {app.config['MAX_WORKERS']} at a time")
+        with ThreadPoolExecutor(max_workers=app.config['MAX_WORKERS']) as executor:
+            futures = [
+                executor.submit(_download_one, url, ydl_opts,
+                                cached.get(video_id_from_url(url), {}).get('title'))
+                for url in urls
+            ]
+            
+            for future in as_completed(futures):
+                url, ok, title, error, info = future.result()
                 if info:
-                    title = info.get('title', 'Unknown Title')
-                    download_status['current_video'] = title
-                    add_log(f"Downloading: {title}")
-                
-                ydl.download([url])
-                download_status['completed'] += 1
-                add_log(f"✓ Completed: {title}", 'success')
-                
-            except Exception as e:
-                download_status['failed'] += 1
-                add_log(f"✗ Failed: {title} - {str(e)}", 'error')
-    
-    # Get list of downloaded files
-    download_status['download_urls'] = []
-    if os.path.exists(output_dir):
-        for file in os.listdir(output_dir):
-            if file.endswith('.mp3'):
-                download_status['download_urls'].append(file)
-    
-    download_status['is_downloading'] = False
-    download_status['current_video'] = ''
-    download_status['progress'] = 0
-    add_log(f"Download complete! {download_status['completed']} succeeded, {download_status['failed']} failed", 'success')
+                    fetched.append((info.get('id'), {
+                        'title': info.get('title'),
+                        'url': info.get('webpage_url'),
+                        'duration': info.get('duration'),
+                    }))
+                if ok:
+                    add_log(f"✓ Completed: {title}", 'success')
+                else:
+                    add_log(f"✗ Failed: {title} - {str(error)}", 'error')
+        
+        put_many(fetched)
+        
+        # Get list of downloaded files
+        download_urls = [name for name, _ in scan_mp3_files(output_dir)]
+        
+        add_log(f"Download complete! {download_status.completed} succeeded, {download_status.failed} failed", 'success')
+    except Exception as e:
+        logger.exception("Download job failed")
+        add_log(f"✗ Download job failed: {str(e)}", 'error')
+    finally:
+        # Always release the job, or every later POST is refused as "in progress"
+        update_status(
+            is_downloading=False,
+            current_video='',
+            progress=0,
+            download_urls=download_urls,
+        )
 
 
 @app.route('/')
@@ -175,8 +506,9 @@ def index():
 @app.route('/api/download', methods=['POST'])
 def start_download():
     """Start a download process."""
-    if download_status['is_downloading']:
-        return jsonify({'error': 'Download already in progress'}), 400
+    with status_lock:
+        if download_status.is_downloading:
+            return jsonify({'error': 'Download already in progress'}), 400
     
     data = request.json
     input_type = data.get('type')
@@ -199,17 +531,25 @@ def start_download():
             url_text = data.get('urls', '').strip()
             if not url_text:
                 return jsonify({'error': 'No URLs provided'}), 400
-            urls = [line.strip() for line in url_text.split('\n') if line.strip() and not line.startswith('#')]
+            # Strip each line once, skip blanks/comments, and dedupe preserving order
+            stripped = (line.strip() for line in url_text.splitlines())
+            urls = list(dict.fromkeys(url for url in stripped if url and not url.startswith('#')))
         
         if not urls:
             return jsonify({'error': 'No valid URLs found'}), 400
         
-        # Clear previous logs and downloads
-        download_status['logs'] = []
-        download_status['download_urls'] = []
+        with status_lock:
+            if download_status.is_downloading:
+                return jsonify({'error': 'Download already in progress'}), 400
+            
+            # Clear previous logs and downloads
+            download_status.is_downloading = True
+            download_status.logs.clear()
+            download_status.download_urls = []
+            publish({'type': 'snapshot', 'status': status_snapshot()})
         
         # Start download in background thread
-        thread = threading.Thread(target=download_audio_thread, args=(urls, app.config['DOWNLOAD_FOLDER']))
+        thread = threading.Thread(target=download_audio_thread, args=(urls, DOWNLOAD_DIR))
         thread.daemon = True
         thread.start()
         
@@ -223,7 +563,51 @@ def start_download():
 @app.route('/api/status')
 def get_status():
     """Get current download status."""
-    return jsonify(download_status)
+    global _status_body
+    with status_lock:
+        version, body, etag = _status_body
+        if version != status_version:
+            body = json.dumps(status_snapshot(), sort_keys=True)
+            etag = hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+            _status_body = (status_version, body, etag)
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate
+    return response
+
+
+def event_stream(subscriber):
+    """Yield server-sent events from a subscriber queue until the client disconnects."""
+    try:
+        while True:
+            try:
+                event = subscriber.get(timeout=15)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            yield f"data: {json.dumps(event)}\n\n"
+    finally:
+        with status_lock:
+            status_subscribers.discard(subscriber)
+
+
+@app.route('/api/events')
+def status_events():
+    """Stream status and log updates as server-sent events."""
+    subscriber = queue.Queue()
+    with status_lock:
+        # Registering and snapshotting under the lock ensures no update is missed
+        status_subscribers.add(subscriber)
+        subscriber.put({'type': 'snapshot', 'status': status_snapshot()})
+    return Response(
+        event_stream(subscriber),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @app.route('/api/download/<filename>')
@@ -231,10 +615,17 @@ def download_file(filename):
     """Download a completed MP3 file."""
     try:
         safe_filename = secure_filename(filename)
-        file_path = os.path.join(app.config['DOWNLOAD_FOLDER'], safe_filename)
+        file_path = f"{DOWNLOAD_DIR}/{safe_filename}"
         
         if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
+            # conditional enables Range/If-Modified-Since handling for resumable downloads
+            response = send_file(file_path, as_attachment=True, conditional=True, max_age=0)
+            # Without X-Sendfile or a sendfile-capable server wrapper, Werkzeug streams
+            # the file in 8 KiB reads; use larger blocks for multi-megabyte MP3s
+            wrapper = getattr(response.response, 'iterable', response.response)
+            if isinstance(wrapper, FileWrapper):
+                wrapper.buffer_size = STREAM_CHUNK_SIZE
+            return response
         else:
             return jsonify({'error': 'File not found'}), 404
             
@@ -246,13 +637,24 @@ def download_file(filename):
 def clear_downloads():
     """Clear all downloaded files."""
     try:
-        download_dir = app.config['DOWNLOAD_FOLDER']
-        if os.path.exists(download_dir):
-            for file in os.listdir(download_dir):
-                if file.endswith('.mp3'):
-                    os.remove(os.path.join(download_dir, file))
+        paths = [path for _, path in scan_mp3_files(DOWNLOAD_DIR)]
+        if paths:
+            # Overlap the unlink syscalls; list() re-raises the first failure
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                list(executor.map(os.unlink, paths))
+        
+        update_status(download_urls=[])
+        return jsonify({'success': True})
         
-        download_status['download_urls'] = []
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/cache/clear')
+def clear_metadata_cache():
+    """Clear the cached video metadata."""
+    try:
+        clear_cache()
         return jsonify({'success': True})
         
     except Exception as e:
@@ -0,0 +1,102 @@
+"""
+On-disk cache of YouTube video metadata, keyed by video ID.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+CACHE_PATH = os.path.expanduser(os.environ.get(
+    'YT_AUDIO_DL_CACHE',
+    os.path.join('~', '.cache', 'yt-audio-dl', 'metadata.db')
+))
+CACHE_TTL = 7 * 24 * 60 * 60  # Seconds before a cached title is considered stale
+
+_VIDEO_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/)([\w-]{11})')
+
+_lock = threading.Lock()
+_initialized = False
+
+
+def _connect():
+    """Open a connection to the cache database, creating it on first use."""
+    global _initialized
+    if not _initialized:
+        Path(CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if not _initialized:
+        with _lock:
+            if not _initialized:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS metadata ('
+                    'video_id TEXT PRIMARY KEY, title TEXT, url TEXT, '
+                    'duration REAL, fetched_at REAL)'
+                )
+                conn.commit()
+                _initialized = True
+    return conn
+
+
+def video_id_from_url(url):
+    """Return the 11-character video ID contained in a YouTube URL, if any."""
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def get_many(video_ids):
+    """Return {video_id: metadata} for the given IDs that have a fresh cache entry."""
+    video_ids = [video_id for video_id in set(video_ids) if video_id]
+    if not video_ids:
+        return {}
+    cutoff = time.time() - CACHE_TTL
+    found = {}
+    try:
+        with closing(_connect()) as conn:
+            # Chunk to stay below SQLite's limit on bound parameters
+            for start in range(0, len(video_ids), 500):
+                chunk = video_ids[start:start + 500]
+                rows = conn.execute(
+                    'SELECT video_id, title, url, duration, fetched_at FROM metadata '
+                    f"WHERE fetched_at >= ? AND video_id IN ({', '.join('?' * len(chunk))})",
+                    (cutoff, *chunk)
+                )
+                for row in rows:
+                    found[row['video_id']] = dict(row)
+    except (sqlite3.Error, OSError):  # The cache is best-effort
+        return {}
+    return found
+
+
+def put_many(entries):
+    """Store metadata (title, url, duration) for many videos in one transaction.
+
+    ``entries`` is an iterable of ``(video_id, meta)`` pairs.
+    """
+    now = time.time()
+    rows = [
+        (video_id, meta.get('title'), meta.get('url'), meta.get('duration'), now)
+        for video_id, meta in entries
+        if video_id and meta.get('title')
+    ]
+    if not rows:
+        return
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO metadata (video_id, title, url, duration, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+    except (sqlite3.Error, OSError):  # The cache is best-effort
+        pass
+
+
+def clear_cache():
+    """Remove all cached metadata."""
+    with closing(_connect()) as conn, conn:
+        conn.execute('DELETE FROM metadata')